@@ -0,0 +1,236 @@
+import argparse
+import contextlib
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import export_issue
+import export_issue_api
+
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+ISSUE_TYPES = ["SQL Injection", "Cross-Site Scripting", "Server Side Request Forgery", "Local File Inclusion"]
+
+
+def build_issues(issue_count):
+    """Build a deterministic list of mock issues sorted by creation time."""
+    rng = random.Random(42)
+    issues = []
+    for i in range(issue_count):
+        issue_type = rng.choice(ISSUE_TYPES)
+        issues.append({
+            "id": f"issue{i:06d}",
+            "createdAt": f"2024-08-24T07:{i // 60 % 60:02d}:{i % 60:02d}.000Z",
+            "name": issue_type,
+            "severity": rng.choice(SEVERITIES),
+            "cvss": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+            "parameter": rng.choice(["id", "q", "file", "redirect"]),
+            "request": {"method": "GET", "url": f"https://brokencrystals.com/api/item/{i}"},
+            "remedy": f"Validate and sanitise user input before using it in {issue_type.lower()} sinks.",
+        })
+    return issues
+
+
+def build_log_archive(issues, noise_lines):
+    """Build a gzipped scan log with the issue lines scattered between regular progress lines."""
+    issue_every = max(1, noise_lines // max(1, len(issues)))
+    lines = []
+    issue_iter = iter(issues)
+    for i in range(noise_lines):
+        lines.append(f"2024-08-24 07:00:{i % 60:02d},000 - INFO - Sent request {i} to https://brokencrystals.com/api/item/{i % 500} (200 OK)\n")
+        if i % issue_every == 0:
+            issue = next(issue_iter, None)
+            if issue:
+                lines.append(
+                    f"2024-08-24 07:00:{i % 60:02d},000 - WARNING - Found new ‘{issue['name']}’ ({issue['severity']}) "
+                    f"vulnerability at: {issue['request']['url']} | {{}}\n"
+                )
+    for issue in issue_iter:
+        lines.append(
+            f"2024-08-24 07:59:59,000 - WARNING - Found new ‘{issue['name']}’ ({issue['severity']}) "
+            f"vulnerability at: {issue['request']['url']} | {{}}\n"
+        )
+    return gzip.compress("".join(lines).encode("utf-8"))
+
+
+class MockBrightSecHandler(BaseHTTPRequestHandler):
+    """Serves /logs/archive and the cursor-paginated issues endpoint for a single mock scan."""
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, delayed ACKs stall every keep-alive response.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        parsed = urlparse(self.path)
+        if parsed.path.endswith("/logs/archive"):
+            self._send_body(self.server.archive, "application/gzip")
+        elif parsed.path.endswith("/issues"):
+            query = parse_qs(parsed.query)
+            limit = int(query.get("limit", ["100"])[0])
+            start = 0
+            if "nextId" in query:
+                start = self.server.issue_index[query["nextId"][0]] + 1
+            page = {"items": self.server.issues[start:start + limit]}
+            self._send_body(json.dumps(page).encode("utf-8"), "application/json")
+        else:
+            self._send_body(b'{"message": "Not Found"}', "application/json", status=404)
+
+    def _send_body(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # Count before writing so the client never sees a response the counters do not include yet.
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+            self.server.requests_served += 1
+        # Write in small chunks with a per-chunk delay to model a limited-bandwidth link.
+        for offset in range(0, len(body), self.server.chunk_size):
+            self.wfile.write(body[offset:offset + self.server.chunk_size])
+            self.wfile.flush()
+            if self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(issues, noise_lines, latency, chunk_size, chunk_delay):
+    """Start the mock server on a free local port and return it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockBrightSecHandler)
+    server.daemon_threads = True
+    server.issues = issues
+    server.issue_index = {issue["id"]: i for i, issue in enumerate(issues)}
+    server.archive = build_log_archive(issues, noise_lines)
+    server.latency = latency
+    server.chunk_size = chunk_size
+    server.chunk_delay = chunk_delay
+    server.lock = threading.Lock()
+    reset_counters(server)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def reset_counters(server):
+    with server.lock:
+        server.bytes_sent = 0
+        server.requests_served = 0
+
+
+class TimedWriter:
+    """Wraps a csv writer and records when the first data row after the header has been written."""
+
+    def __init__(self, writer, first_row_at):
+        self._writer = writer
+        self._first_row_at = first_row_at
+        self._rows_written = 0
+
+    def writerow(self, row):
+        result = self._writer.writerow(row)
+        self._rows_written += 1
+        if self._rows_written == 2 and not self._first_row_at:
+            self._first_row_at.append(time.perf_counter())
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._writer, name)
+
+
+@contextlib.contextmanager
+def time_first_row():
+    """Hook csv.writer, which both exporters use, to time their first written row."""
+    first_row_at = []
+    original_writer = csv.writer
+    csv.writer = lambda *args, **kwargs: TimedWriter(original_writer(*args, **kwargs), first_row_at)
+    try:
+        yield first_row_at
+    finally:
+        csv.writer = original_writer
+
+
+def run_export(server, export, csv_name):
+    """Run one exporter into a temporary directory and time it from the first request to the finished CSV."""
+    reset_counters(server)
+    output = io.StringIO()
+    with tempfile.TemporaryDirectory() as output_directory:
+        # Both exporters print progress; keep the benchmark output readable.
+        with time_first_row() as first_row_at, contextlib.redirect_stdout(output):
+            start = time.perf_counter()
+            export(output_directory)
+            total = time.perf_counter() - start
+        csv_path = os.path.join(output_directory, csv_name)
+        if os.path.exists(csv_path):
+            with open(csv_path, newline='') as csv_file:
+                rows = sum(1 for _ in csv.reader(csv_file)) - 1
+        else:
+            rows = 0
+    if not rows:
+        print(output.getvalue(), end="")
+    first_row = first_row_at[0] - start if first_row_at else None
+    return first_row, total, rows, server.bytes_sent, server.requests_served
+
+
+def run_archive_export(server, base_url):
+    """Run export_issue.py: download, decompress and filter the log archive into a CSV."""
+    return run_export(
+        server,
+        lambda output_directory: export_issue.fetch_and_save_file("mock-key", "mock-scan", output_directory, base_url),
+        "filtered_vulnerabilities.csv",
+    )
+
+
+def run_api_export(server, base_url, page_limit):
+    """Run export_issue_api.py: page through the issues API into a CSV."""
+    return run_export(
+        server,
+        lambda output_directory: export_issue_api.export_issues(
+            "mock-key", "mock-scan", output_directory, base_url, ("High", "Critical"), page_limit
+        ),
+        "issues.csv",
+    )
+
+
+def report(label, runs):
+    first_rows, totals, rows, bytes_sent, requests_served = zip(*runs)
+    if None in first_rows:
+        first_row = "     n/a"
+    else:
+        first_row = f"{statistics.median(first_rows) * 1000:8.1f}"
+    print(
+        f"{label:<12} time-to-first-row {first_row} ms | "
+        f"total {statistics.median(totals) * 1000:8.1f} ms | "
+        f"{rows[0]:>5} rows | "
+        f"{bytes_sent[0]:>10} bytes in {requests_served[0]} requests"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the log-archive and issues-API exporters against a local mock server.")
+    parser.add_argument("--issues", type=int, default=500, help="Number of mock issues (default: 500).")
+    parser.add_argument("--noise-lines", type=int, default=50000, help="Non-issue log lines in the archive (default: 50000).")
+    parser.add_argument("--page-limit", type=int, default=100, help="Issues per API page (default: 100).")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Per-request latency of the mock (default: 20).")
+    parser.add_argument("--chunk-size", type=int, default=16384, help="Bytes written per chunk by the mock (default: 16384).")
+    parser.add_argument("--chunk-delay-ms", type=float, default=1, help="Delay after each written chunk (default: 1).")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per exporter, the median is reported (default: 5).")
+
+    args = parser.parse_args()
+
+    server = start_mock_server(
+        build_issues(args.issues), args.noise_lines, args.latency_ms / 1000, args.chunk_size, args.chunk_delay_ms / 1000
+    )
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        report("logs/archive", [run_archive_export(server, base_url) for _ in range(args.repeat)])
+        report("issues API", [run_api_export(server, base_url, args.page_limit) for _ in range(args.repeat)])
+    finally:
+        server.shutdown()
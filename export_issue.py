@@ -4,11 +4,11 @@ import os
 import csv
 import requests
 
-def fetch_and_save_file(api_key, scan_id, output_directory="."):
+def fetch_and_save_file(api_key, scan_id, output_directory=".", base_url="https://eu.brightsec.com"):
     """
     Fetch a GZIP file from BrightSec API, decompress it, and save without any extension.
     """
-    url = f"https://eu.brightsec.com/api/v1/scans/{scan_id}/logs/archive"
+    url = f"{base_url}/api/v1/scans/{scan_id}/logs/archive"
     headers = {
         "Authorization": f"Api-Key {api_key}",
         "Accept": "application/json"
@@ -91,7 +91,8 @@ if __name__ == "__main__":
     parser.add_argument("--api-key", required=True, help="Your BrightSec API key.")
     parser.add_argument("--scan-id", required=True, help="The scan ID for fetching logs.")
     parser.add_argument("--output-dir", default=".", help="Directory to save the files (default: current directory).")
+    parser.add_argument("--base-url", default="https://eu.brightsec.com", help="BrightSec base URL (default: https://eu.brightsec.com).")
 
     args = parser.parse_args()
 
-    fetch_and_save_file(args.api_key, args.scan_id, args.output_dir)
+    fetch_and_save_file(args.api_key, args.scan_id, args.output_dir, args.base_url)
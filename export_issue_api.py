@@ -0,0 +1,237 @@
+import argparse
+import codecs
+import csv
+import json
+import os
+import queue
+import re
+import threading
+import requests
+
+CSV_HEADER = ["Severity", "Type", "URL", "Parameter", "CVSS", "Remediation"]
+
+_WHITESPACE = re.compile(r"[ \t\n\r,]*")
+_DELIMITERS = " \t\n\r,]}"
+_END_OF_ISSUES = object()
+
+# (connect, read) timeout for every page request, so a stalled server cannot block the fetcher forever.
+REQUEST_TIMEOUT = (10, 60)
+
+
+def iter_page_items(chunks):
+    """
+    Incrementally decode a page of the form {"items": [...], ...} and yield every element
+    of "items" as soon as it has been fully received. Other top-level keys are skipped.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    state = "start"
+    finished = False
+    chunks = iter(chunks)
+
+    while state != "done":
+        position = _WHITESPACE.match(buffer, position).end()
+        try:
+            if position >= len(buffer):
+                raise ValueError("need more data")
+            if state == "start":
+                if buffer[position] != "{":
+                    raise json.JSONDecodeError("Expected '{'", buffer, position)
+                position += 1
+                state = "key"
+            elif state == "key":
+                if buffer[position] == "}":
+                    position += 1
+                    state = "done"
+                    continue
+                key, end = decoder.raw_decode(buffer, position)
+                colon = _WHITESPACE.match(buffer, end).end()
+                if colon >= len(buffer):
+                    raise ValueError("need more data")
+                if buffer[colon] != ":":
+                    raise json.JSONDecodeError("Expected ':'", buffer, colon)
+                position = colon + 1
+                state = "array_open" if key == "items" else "value"
+            elif state == "value":
+                _, end = decoder.raw_decode(buffer, position)
+                _require_delimiter(buffer, end, finished)
+                position = end
+                state = "key"
+            elif state == "array_open":
+                if buffer[position] != "[":
+                    raise json.JSONDecodeError("Expected '['", buffer, position)
+                position += 1
+                state = "items"
+            elif state == "items":
+                if buffer[position] == "]":
+                    position += 1
+                    state = "key"
+                    continue
+                item, end = decoder.raw_decode(buffer, position)
+                _require_delimiter(buffer, end, finished)
+                position = end
+                yield item
+        except ValueError as e:
+            # JSONDecodeError is a ValueError: an incomplete value looks the same as a broken one
+            # until the stream ends, so only re-raise once there is nothing more to read.
+            if finished:
+                raise json.JSONDecodeError("Truncated or invalid issues page", buffer, position) from e
+            buffer = buffer[position:]
+            position = 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                buffer += text_decoder.decode(b"", final=True)
+                finished = True
+            else:
+                buffer += text_decoder.decode(chunk)
+
+
+def _require_delimiter(buffer, end, finished):
+    """
+    A scalar cut off at a chunk boundary still decodes ("12" of "123", "1.5" of "1.5e3"),
+    so a value only counts once the delimiter after it has been received.
+    """
+    if not finished and (end >= len(buffer) or buffer[end] not in _DELIMITERS):
+        raise ValueError("need more data")
+
+
+def _put(items_queue, item, stop):
+    """Put an item on the queue unless the consumer has stopped; return False once it has."""
+    while not stop.is_set():
+        try:
+            items_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _fetch_pages(session, base_url, headers, page_limit, items_queue, stop):
+    """
+    Walk the cursor-paginated issues endpoint and push every issue onto the queue.
+    Runs in a background thread so the next page is requested while rows are still being written,
+    and returns as soon as `stop` is set.
+    """
+    params = {"limit": page_limit}
+    try:
+        while params:
+            last_item = None
+            item_count = 0
+            with session.get(base_url, headers=headers, params=params, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                for item in iter_page_items(response.iter_content(chunk_size=8192)):
+                    if not _put(items_queue, item, stop):
+                        return
+                    last_item = item
+                    item_count += 1
+
+            # A short page is the last one; an empty page stays the fallback if the server caps the limit.
+            if last_item is not None and item_count >= page_limit:
+                params = {"limit": page_limit, "nextId": last_item['id'], "nextCreatedAt": last_item['createdAt']}
+            else:
+                params = None
+        _put(items_queue, _END_OF_ISSUES, stop)
+    except Exception as e:
+        _put(items_queue, e, stop)
+
+
+def iter_issues(api_key, scan_id, base_url="https://eu.brightsec.com", page_limit=100, session=None):
+    """
+    Yield the issues of a scan one by one while the remaining pages are fetched in the background.
+    A single keep-alive session is reused for every page; it is closed afterwards if it was created here.
+    """
+    url = f"{base_url}/api/v2/scans/{scan_id}/issues"
+    headers = {
+        "Authorization": f"Api-Key {api_key}",
+        "Accept": "application/json"
+    }
+    owns_session = session is None
+    session = session or requests.Session()
+    # Holds up to two pages, so the fetcher can keep downloading while the writer catches up.
+    items_queue = queue.Queue(maxsize=page_limit * 2)
+    stop = threading.Event()
+    fetcher = threading.Thread(
+        target=_fetch_pages, args=(session, url, headers, page_limit, items_queue, stop), daemon=True
+    )
+    fetcher.start()
+
+    try:
+        while True:
+            item = items_queue.get()
+            if item is _END_OF_ISSUES:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Also runs when the consumer closes the generator early or fails while writing.
+        stop.set()
+        fetcher.join()
+        if owns_session:
+            session.close()
+
+
+def issue_to_row(issue):
+    """Map an issue object to a CSV row matching CSV_HEADER."""
+    request = issue.get("request") or issue.get("originalRequest") or {}
+    return [
+        issue.get("severity", ""),
+        issue.get("name", ""),
+        request.get("url") or issue.get("url", ""),
+        issue.get("parameter") or issue.get("param") or "",
+        issue.get("cvss", ""),
+        issue.get("remedy") or issue.get("remediation") or "",
+    ]
+
+
+def iter_issue_rows(api_key, scan_id, base_url="https://eu.brightsec.com", severities=("High", "Critical"), page_limit=100):
+    """Yield CSV rows for the issues of a scan whose severity is in `severities` (all if empty)."""
+    for issue in iter_issues(api_key, scan_id, base_url, page_limit):
+        if severities and issue.get("severity") not in severities:
+            continue
+        yield issue_to_row(issue)
+
+
+def export_issues(api_key, scan_id, output_directory=".", base_url="https://eu.brightsec.com", severities=("High", "Critical"), page_limit=100):
+    """
+    Page through the issues API of a scan and write structured rows into a CSV file as they arrive.
+    """
+    csv_path = os.path.join(output_directory, "issues.csv")
+    try:
+        with open(csv_path, "w", newline='') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(CSV_HEADER)
+
+            row_count = 0
+            for row in iter_issue_rows(api_key, scan_id, base_url, severities, page_limit):
+                csv_writer.writerow(row)
+                csv_file.flush()
+                row_count += 1
+
+        if row_count:
+            print(f"{row_count} issues saved to {csv_path}")
+        else:
+            print("No matching issues found.")
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching issues: {e}")
+    except json.JSONDecodeError as e:
+        print(f"Error decoding issues page: {e}")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export scan issues from the BrightSec issues API into a CSV file.")
+    parser.add_argument("--api-key", required=True, help="Your BrightSec API key.")
+    parser.add_argument("--scan-id", required=True, help="The scan ID to export issues for.")
+    parser.add_argument("--output-dir", default=".", help="Directory to save the CSV file (default: current directory).")
+    parser.add_argument("--base-url", default="https://eu.brightsec.com", help="BrightSec base URL (default: https://eu.brightsec.com).")
+    parser.add_argument("--severities", default="High,Critical", help="Comma-separated severities to keep, empty for all (default: High,Critical).")
+    parser.add_argument("--page-limit", type=int, default=100, help="Issues requested per page (default: 100).")
+
+    args = parser.parse_args()
+
+    severities = tuple(s.strip() for s in args.severities.split(",") if s.strip())
+    export_issues(args.api_key, args.scan_id, args.output_dir, args.base_url, severities, args.page_limit)
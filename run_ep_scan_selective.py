@@ -0,0 +1,412 @@
+import argparse
+import json
+import requests
+import logging
+import re
+from urllib.parse import urlparse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Full test list used by run_ep_scan.py and run_ep_scan_from_file.py.
+ALL_TESTS = [
+    "amazon_s3_takeover",
+    "brute_force_login",
+    "xxe",
+    "cve_test",
+    "csrf",
+    "common_files",
+    "wordpress",
+    "cookie_security",
+    "xss",
+    "css_injection",
+    "default_login_location",
+    "html_injection",
+    "retire_js",
+    "open_cloud_storage",
+    "proto_pollution",
+    "secret_tokens",
+    "stored_xss",
+    "unvalidated_redirect",
+    "version_control_systems",
+    "iframe_injection",
+    "bopla",
+    "business_constraint_bypass",
+    "date_manipulation",
+    "excessive_data_exposure",
+    "id_enumeration",
+    "insecure_output_handling",
+    "mass_assignment",
+    "password_reset_poisoning",
+    "prompt_injection",
+    "jwt",
+    "broken_saml_auth",
+    "directory_listing",
+    "email_injection",
+    "file_upload",
+    "full_path_disclosure",
+    "graphql_introspection",
+    "header_security",
+    "http_method_fuzzing",
+    "improper_asset_management",
+    "insecure_tls_configuration",
+    "ldapi",
+    "lfi",
+    "nosql",
+    "open_database",
+    "osi",
+    "rfi",
+    "sqli",
+    "server_side_js_injection",
+    "ssrf",
+    "ssti",
+    "xpathi",
+]
+
+# Tests that only make sense for a specific kind of entry point.
+# Everything in ALL_TESTS that is not listed here (xxe included) runs against every entry point.
+CATEGORY_TESTS = {
+    "graphql": ["graphql_introspection"],
+    "wordpress": ["wordpress"],
+    "saml": ["broken_saml_auth"],
+    "upload": ["file_upload"],
+    "login": ["brute_force_login", "password_reset_poisoning"],
+    "json_api": ["bopla", "mass_assignment", "excessive_data_exposure"],
+}
+
+# Platform-specific categories, the only ones gated with --conservative.
+CONSERVATIVE_CATEGORIES = {"graphql", "wordpress", "saml", "upload"}
+
+# Tests that probe the whole host; kept on one entry point per host even if nothing there was classified.
+HOST_LEVEL_CATEGORIES = {"graphql", "wordpress"}
+
+CONDITIONAL_TESTS = {test for tests in CATEGORY_TESTS.values() for test in tests}
+BASE_TESTS = [test for test in ALL_TESTS if test not in CONDITIONAL_TESTS]
+
+URL_PATTERNS = {
+    "graphql": re.compile(r"graphql|graphiql", re.IGNORECASE),
+    "wordpress": re.compile(r"/wp-(admin|content|includes|json|login)|xmlrpc\.php|wordpress", re.IGNORECASE),
+    "saml": re.compile(r"saml|/sso\b|/acs\b", re.IGNORECASE),
+    "upload": re.compile(r"upload|attachment|/import\b", re.IGNORECASE),
+    "login": re.compile(r"log-?in|sign-?in|logon|/auth|/session|/token|password|reset|forgot", re.IGNORECASE),
+}
+
+# Only used for API detection when the entry point has no content-type.
+API_URL_PATTERN = re.compile(r"/api/|/v\d+/|/rest/|\.json\b", re.IGNORECASE)
+GRAPHQL_BODY_PATTERN = re.compile(r'"query"\s*:\s*"\s*(query|mutation|subscription|\{)', re.IGNORECASE)
+
+def get_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="BrightSec Entry-Point-Aware Scan Script")
+    parser.add_argument('--api_key', type=str, required=True, help="API Key for BrightSec")
+    parser.add_argument('--scan_name', type=str, required=True, help="Scan name for BrightSec")
+    parser.add_argument('--project_name', type=str, required=True, help="Project name")
+    parser.add_argument('--project_id', type=str, required=True, help="Project ID")
+    parser.add_argument('--entrypoints_file', type=str, default=None, help="Optional file with entry point IDs to restrict the scan to")
+    parser.add_argument('--hostname', type=str, default="app.brightsec.com", help="BrightSec hostname (default: app.brightsec.com)")
+    parser.add_argument('--min_group_size', type=int, default=20, help="Merge groups with fewer entry points than this (default: 20)")
+    parser.add_argument('--min_saving', type=float, default=0.05, help="Merge groups whose separate scan saves less than this share of all test x entry-point pairs (default: 0.05)")
+    parser.add_argument('--max_scans', type=int, default=3, help="Maximum number of scans to launch (default: 3)")
+    parser.add_argument('--conservative', action='store_true', help="Only gate platform-specific tests (GraphQL, WordPress, SAML, upload)")
+    parser.add_argument('--dry_run', action='store_true', help="Only report the test selection, do not start any scan")
+    return parser.parse_args()
+
+def fetch_entry_points(api_key, hostname, project_id, skip_tested=True):
+    """Fetch entry points with their URL, method and content-type for a project, skipping tested ones unless told otherwise."""
+    headers = {
+        "accept": "application/json",
+        "Authorization": f"api-key {api_key}",
+        "Content-Type": "application/json",
+    }
+
+    base_url = f'https://{hostname}/api/v2/projects/{project_id}/entry-points'
+    url = f"{base_url}?limit=500"
+    entry_points = []
+
+    page_number = 1
+    while url:
+        logger.info(f"Fetching page {page_number} of entry points for project {project_id}")
+        response = requests.get(url, headers=headers)
+        if response.status_code == 200:
+            data = response.json()
+            new_entry_points = [
+                {
+                    "id": item['id'],
+                    "url": item.get('url') or '',
+                    "method": item.get('method') or 'GET',
+                    "content_type": get_content_type(item),
+                    "body": get_request_body(item),
+                }
+                for item in data['items']
+                if not skip_tested or item.get('status') != 'tested'
+            ]
+            entry_points.extend(new_entry_points)
+
+            if 'items' in data and data['items']:
+                last_id = data['items'][-1]['id']
+                last_created_at = data['items'][-1]['createdAt']
+                url = f"{base_url}?limit=500&nextId={last_id}&nextCreatedAt={last_created_at}"
+                page_number += 1
+            else:
+                url = None
+        else:
+            logger.error(f"Failed to fetch data for project {project_id}: {response.status_code}")
+            url = None
+
+    logger.info(f"Fetched {len(entry_points)} entry points for project {project_id}.")
+    return entry_points
+
+def get_content_type(item):
+    """Extract the request content-type of an entry point, if the API returned one."""
+    if item.get('contentType'):
+        return item['contentType'].lower()
+
+    request_headers = (item.get('request') or {}).get('headers') or {}
+    if isinstance(request_headers, list):
+        request_headers = {header.get('name', ''): header.get('value', '') for header in request_headers}
+    for name, value in request_headers.items():
+        if name.lower() == 'content-type':
+            return str(value).lower()
+    return ''
+
+def get_request_body(item):
+    """Extract the request body of an entry point, if the API returned one."""
+    body = item.get('body') or (item.get('request') or {}).get('body') or ''
+    return body if isinstance(body, str) else json.dumps(body)
+
+def get_entry_point_ids_from_file(filepath):
+    """Reads entry point IDs from a file."""
+    try:
+        with open(filepath, 'r') as file:
+            entry_point_ids = [line.strip() for line in file.readlines() if line.strip()]
+            logger.info(f"Loaded {len(entry_point_ids)} entry points from {filepath}")
+            return entry_point_ids
+    except Exception as e:
+        logger.error(f"Error reading entry points from file: {e}")
+        return []
+
+def classify_entry_point(entry_point):
+    """Return the set of categories an entry point belongs to, based on URL, method and content-type."""
+    url = entry_point['url']
+    method = entry_point['method'].upper()
+    content_type = entry_point['content_type']
+
+    categories = {category for category, pattern in URL_PATTERNS.items() if pattern.search(url)}
+
+    # GraphQL clients usually POST application/json to paths like /api or /query.
+    if 'graphql' in content_type or GRAPHQL_BODY_PATTERN.search(entry_point['body']):
+        categories.add('graphql')
+    if 'multipart/form-data' in content_type:
+        categories.add('upload')
+    if 'json' in content_type or (not content_type and API_URL_PATTERN.search(url)):
+        categories.add('json_api')
+    # File uploads are only exercised through requests carrying a body.
+    if method == 'GET':
+        categories.discard('upload')
+    return categories
+
+def select_tests(categories, conservative=False):
+    """Return the tests, in ALL_TESTS order, that apply to the given categories."""
+    selected = set(BASE_TESTS)
+    for category in CATEGORY_TESTS:
+        if category in categories or (conservative and category not in CONSERVATIVE_CATEGORIES):
+            selected.update(CATEGORY_TESTS[category])
+    return [test for test in ALL_TESTS if test in selected]
+
+def classify_entry_points(entry_points):
+    """
+    Classify every entry point. Host-level tests are kept on the shortest URL of each host
+    where no entry point was classified for them, since the metadata can miss e.g. WordPress pretty permalinks.
+    """
+    classified = [(entry_point, classify_entry_point(entry_point)) for entry_point in entry_points]
+
+    hosts = {}
+    for entry_point, categories in classified:
+        hosts.setdefault(urlparse(entry_point['url']).netloc, []).append((entry_point, categories))
+    for host_entry_points in hosts.values():
+        _, root_categories = min(host_entry_points, key=lambda pair: len(pair[0]['url']))
+        for category in HOST_LEVEL_CATEGORIES:
+            if not any(category in categories for _, categories in host_entry_points):
+                root_categories.add(category)
+    return classified
+
+def group_entry_points(entry_points, conservative=False):
+    """Group entry point IDs by the test set that applies to them."""
+    groups = {}
+    for entry_point, categories in classify_entry_points(entry_points):
+        tests = tuple(select_tests(categories, conservative))
+        group = groups.setdefault(tests, {"categories": set(), "entry_point_ids": []})
+        group["categories"].update(categories)
+        group["entry_point_ids"].append(entry_point['id'])
+    return groups
+
+def merge_cost(tests, group, other_tests, other_group):
+    """Extra test x entry-point pairs caused by merging two groups into one scan."""
+    merged = set(tests) | set(other_tests)
+    return (
+        (len(merged) - len(tests)) * len(group["entry_point_ids"])
+        + (len(merged) - len(other_tests)) * len(other_group["entry_point_ids"])
+    )
+
+def merge_groups(groups, min_group_size, min_saving, max_scans):
+    """
+    Merge every group whose cheapest merge (usually into its nearest superset) costs less than
+    min_saving of all test x entry-point pairs, or that is smaller than min_group_size,
+    then keep merging the cheapest pair until at most max_scans groups remain.
+    Every scan repeats crawling and setup, so a group is only worth its own scan if it saves enough.
+    """
+    groups = dict(groups)
+    full_pairs = sum(len(group["entry_point_ids"]) for group in groups.values()) * len(ALL_TESTS)
+    while len(groups) > 1:
+        cheapest_merges = [
+            min(
+                (merge_cost(source, groups[source], target, groups[target]), source, target)
+                for target in groups
+                if target != source
+            )
+            for source in groups
+        ]
+        candidates = [
+            (cost, source, target) for cost, source, target in cheapest_merges
+            if cost < min_saving * full_pairs or len(groups[source]["entry_point_ids"]) < min_group_size
+        ]
+        if not candidates and len(groups) <= max_scans:
+            break
+
+        _, source, target = min(candidates or cheapest_merges)
+        source_group = groups.pop(source)
+        target_group = groups.pop(target)
+        merged_tests = tuple(test for test in ALL_TESTS if test in set(source) | set(target))
+        merged = groups.setdefault(merged_tests, {"categories": set(), "entry_point_ids": []})
+        for group in (source_group, target_group):
+            merged["categories"].update(group["categories"])
+            merged["entry_point_ids"].extend(group["entry_point_ids"])
+    return groups
+
+def report_reduction(entry_points, groups):
+    """Log the estimated reduction in test x entry-point pairs and the number of scans, and return (full, selected)."""
+    full_pairs = len(entry_points) * len(ALL_TESTS)
+    selected_pairs = sum(len(tests) * len(group["entry_point_ids"]) for tests, group in groups.items())
+    reduction = 100.0 * (full_pairs - selected_pairs) / full_pairs if full_pairs else 0.0
+    scans = f"{len(groups)} scan" if len(groups) == 1 else f"{len(groups)} scans"
+
+    for tests, group in groups.items():
+        label = ", ".join(sorted(group["categories"])) or "generic"
+        logger.info(f"Group [{label}]: {len(group['entry_point_ids'])} entry points x {len(tests)} tests")
+    logger.info(
+        f"Test x entry-point pairs: {full_pairs} with the full test list in 1 scan, {selected_pairs} after selection "
+        f"({reduction:.1f}% reduction) in {scans}. Each additional scan repeats crawling and setup."
+    )
+    return full_pairs, selected_pairs
+
+def start_scan(api_key, hostname, project_id, project_name, entry_point_ids, scan_name, tests):
+    """Starts a scan with the provided entry points and tests."""
+    if len(entry_point_ids) == 0:
+        logger.info(f"No entry points found for project {project_name}. Skipping scan.")
+        return
+
+    scan_payload = {
+        "name": scan_name,
+        "poolSize": 10,
+        "smart": True,
+        "optimizedCrawler": True,
+        "maxInteractionsChainLength": 3,
+        "skipStaticParams": True,
+        "slowEpTimeout": None,
+        "extraHosts": None,
+        "fileId": None,
+        "targetTimeout": 5,
+        "exclusions": {
+            "requests": [
+                {
+                    "patterns": [
+                        r"(?<excluded_file_ext>(\/\/[^?#]+\.)((?<image>jpg|jpeg|png|gif|svg|eps|webp|tif|tiff|bmp|psd|ai|raw|cr|pcx|tga|ico)|(?<video>mp4|avi|3gp|flv|h264|m4v|mkv|mov|mpg|mpeg|vob|wmv)|(?<audio>wav|mp3|ogg|wma|mid|midi|aif)|(?<document>doc|docx|odt|pdf|rtf|ods|xls|xlsx|odp|ppt|pptx)|(?<font>ttf|otf|fnt|fon))(?:$|#|\?))"
+                    ],
+                    "methods": []
+                },
+                {
+                    "patterns": ["logout|signout"]
+                }
+            ]
+        },
+        "projectId": project_id,
+# Before running the script, verify if a repeater is required.
+# If needed, include the Repeater ID in the payload configuration.
+#       "repeaters": ["{REPEATER_ID}"],
+        "entryPointIds": entry_point_ids,
+        "schedule": {"type": "future", "nextRunAt": "2024-08-24T07:00:54.830Z"},
+        "module": "dast",
+# Provide the option to select either a bucket of tests or a specific list of individual tests to run against the target.
+# For details about available tests and their functionalities, refer to our documentation -> https://docs.brightsec.com/docs/creating-a-modern-scan
+# The list is selected per group of entry points, see CATEGORY_TESTS.
+        "tests": list(tests),
+#       "buckets": ["api", "business_logic", "client_side", "cve", "legacy", "server_side"],
+#        Define which parts of the HTTP(S) request to test for vulnerabilities.
+#        Only parameters of the selected parts will be added to the scan’s attack surface
+        "attackParamLocations": ["query", "fragment", "body"],
+        "info": {"source": "api"}
+    }
+
+    url = f"https://{hostname}/api/v1/scans"
+    headers = {
+        'accept': 'application/json',
+        'Content-Type': 'application/json',
+        'Authorization': f"api-key {api_key}",
+    }
+
+    session = requests.Session()
+    request = requests.Request('POST', url, headers=headers, json=scan_payload)
+    prepared_request = session.prepare_request(request)
+
+    try:
+        response = session.send(prepared_request)
+        if response.status_code == 201:
+            response_json = response.json()
+            scan_id = response_json.get('id', 'No ID found in response')
+            logger.info(f"Request succeeded with status code 201. Scan ID: {scan_id}")
+        else:
+            logger.error(f"Request failed with status code {response.status_code}: {response.text}")
+    except ValueError as e:
+        logger.error(f"ValueError: {e}")
+
+if __name__ == "__main__":
+    args = get_args()
+
+    if args.entrypoints_file:
+        # Like run_ep_scan_from_file.py, scan exactly the listed IDs, whatever their status.
+        wanted_ids = get_entry_point_ids_from_file(args.entrypoints_file)
+        entry_points = fetch_entry_points(args.api_key, args.hostname, args.project_id, skip_tested=False)
+        known_ids = {ep['id'] for ep in entry_points}
+        missing_ids = [ep_id for ep_id in wanted_ids if ep_id not in known_ids]
+        if missing_ids:
+            logger.warning(
+                f"{len(missing_ids)} entry points listed in {args.entrypoints_file} were not returned by the API "
+                f"and will not be scanned: {', '.join(missing_ids)}"
+            )
+        wanted_ids = set(wanted_ids)
+        entry_points = [ep for ep in entry_points if ep['id'] in wanted_ids]
+        logger.info(f"Restricted to {len(entry_points)} entry points listed in {args.entrypoints_file}.")
+    else:
+        entry_points = fetch_entry_points(args.api_key, args.hostname, args.project_id)
+
+    groups = group_entry_points(entry_points, args.conservative)
+    groups = merge_groups(groups, args.min_group_size, args.min_saving, args.max_scans)
+    report_reduction(entry_points, groups)
+
+    if not args.dry_run:
+        for tests, group in groups.items():
+            label = "+".join(sorted(group["categories"])) or "generic"
+            start_scan(
+                args.api_key,
+                args.hostname,
+                args.project_id,
+                args.project_name,
+                group["entry_point_ids"],
+                f"{args.scan_name} [{label}]",
+                tests,
+            )
+
+    if args.dry_run:
+        print(f"Dry run: entry points have been grouped by applicable tests, no scans were started.")
+    else:
+        print(f"Entry points have been grouped by applicable tests and scans have been initiated.")